@@ -8,54 +8,280 @@ Usage:
     python scripts/calculate_thresholds.py
     python scripts/calculate_thresholds.py --input-dir baseline-results/
     python scripts/calculate_thresholds.py --safety-margin 0.30
+    python scripts/calculate_thresholds.py --no-cache
 """
 
 from __future__ import annotations
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import UTC, datetime
 import json
+import math
 from pathlib import Path
-import statistics
 import sys
 import traceback
 from typing import Any
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 PROJECT_ROOT = Path(__file__).parent.parent
 
+# Per-operation fields read by aggregate_operation_stats
+AGGREGATED_FIELDS = ("iterations_successful", "p95", "max", "parallel")
+
+# Cache of already-extracted baseline fields, relative to the input directory
+BASELINE_CACHE_FILE = Path(".cache") / "baseline_stats.json"
+
+# Bump when the cache entry layout changes; a mismatch discards the cache
+BASELINE_CACHE_VERSION = 2
+
+
+def _slim_baseline(data: dict[str, Any]) -> dict[str, Any]:
+    """Reduce a parsed baseline to the fields needed for aggregation.
+
+    Raw samples (``all_durations``) and metadata are dropped so that only a
+    few numbers per operation stay alive while all files are aggregated.
+
+    Args:
+        data: Parsed baseline JSON document
+
+    Returns:
+        Baseline dictionary containing only the aggregated operation fields
+    """
+    return {
+        "operations": {
+            op_name: {field: op_stats[field] for field in AGGREGATED_FIELDS if field in op_stats}
+            for op_name, op_stats in data.get("operations", {}).items()
+        }
+    }
+
+
+def _json_loads(data: bytes) -> Any:
+    """Decode JSON bytes, using orjson when it is installed.
+
+    Args:
+        data: UTF-8 encoded JSON document
+
+    Returns:
+        Decoded JSON value
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _load_cache(cache_file: Path) -> dict[str, Any]:
+    """Load the baseline extraction cache.
+
+    The cache is only used if it was written with the current cache version
+    and the same ``AGGREGATED_FIELDS``; otherwise every file is parsed again.
+
+    Args:
+        cache_file: Path to the cache JSON file
+
+    Returns:
+        Cache entries keyed by baseline file name (empty if missing, invalid
+        or stale)
+    """
+    try:
+        cache = _json_loads(cache_file.read_bytes())
+    except (OSError, ValueError):
+        return {}
+
+    if (
+        not isinstance(cache, dict)
+        or cache.get("version") != BASELINE_CACHE_VERSION
+        or cache.get("fields") != list(AGGREGATED_FIELDS)
+        or not isinstance(cache.get("files"), dict)
+    ):
+        return {}
+
+    return cache["files"]
+
+
+def _save_cache(cache_file: Path, cache: dict[str, Any]) -> None:
+    """Atomically write the baseline extraction cache.
+
+    Args:
+        cache_file: Path to the cache JSON file
+        cache: Cache entries keyed by baseline file name
+    """
+    document = {
+        "version": BASELINE_CACHE_VERSION,
+        "fields": list(AGGREGATED_FIELDS),
+        "files": cache,
+    }
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = cache_file.with_suffix(".tmp")
+        with tmp_file.open("w", encoding="utf-8") as f:
+            json.dump(document, f)
+        tmp_file.replace(cache_file)
+    except OSError as e:
+        print(f"⚠️  Warning: Could not write cache {cache_file}: {e}")
+
+
+def _parse_jsonl_baselines(data: bytes, file_path: Path) -> list[dict[str, Any]]:
+    """Group JSONL operation records into one slim baseline per run.
+
+    Each line written by ``measure_performance_baseline.py --output *.jsonl``
+    holds the stats of one operation; lines sharing a timestamp belong to the
+    same run. Invalid lines, such as a half-written line left by an
+    interrupted append, are skipped with a warning.
+
+    Args:
+        data: Contents of a JSONL baseline file
+        file_path: Path of the file, used in warnings
+
+    Returns:
+        Slim baseline dictionaries, one per run in file order
+    """
+    runs: dict[str, dict[str, Any]] = {}
+    for line_number, line in enumerate(data.splitlines(), start=1):
+        if not line.strip():
+            continue
+        try:
+            record = _json_loads(line)
+            operation = record["operation"]
+            timestamp = record.get("timestamp", "")
+        except (ValueError, KeyError, TypeError, AttributeError) as e:
+            print(f"⚠️  Warning: Skipping invalid line {line_number} in {file_path}: {e!r}")
+            continue
+        run = runs.setdefault(timestamp, {"operations": {}})
+        run["operations"][operation] = record
+
+    return [_slim_baseline(run) for run in runs.values()]
+
 
-def load_baseline_files(input_dir: Path) -> list[dict[str, Any]]:
-    """Load all baseline JSON files from directory.
+def _load_baseline(file_path: Path, cache: dict[str, Any]) -> dict[str, Any]:
+    """Load one baseline file, reusing the cached extraction when unchanged.
+
+    Args:
+        file_path: Path to the baseline JSON or JSONL file
+        cache: Cache entries keyed by baseline file name
+
+    Returns:
+        Cache entry with ``mtime_ns``, ``size`` and the slim ``baselines``
+    """
+    stat = file_path.stat()
+    entry = cache.get(file_path.name)
+    if (
+        isinstance(entry, dict)
+        and entry.get("mtime_ns") == stat.st_mtime_ns
+        and entry.get("size") == stat.st_size
+    ):
+        return entry
+
+    data = file_path.read_bytes()
+    if file_path.suffix == ".jsonl":
+        baselines = _parse_jsonl_baselines(data, file_path)
+    else:
+        baselines = [_slim_baseline(_json_loads(data))]
+
+    return {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "baselines": baselines}
+
+
+def load_baseline_files(input_dir: Path, use_cache: bool = True) -> list[dict[str, Any]]:
+    """Load all baseline JSON and JSONL files from directory.
+
+    Files whose modification time and size match the cache in
+    ``input_dir/.cache/`` are not parsed again.
 
     Args:
         input_dir: Directory containing baseline JSON files
+        use_cache: Reuse and update the on-disk extraction cache
 
     Returns:
-        List of baseline data dictionaries
+        List of baseline data dictionaries, reduced to the aggregated fields
     """
-    baseline_files = list(input_dir.glob("performance_baselines*.json"))
+    baseline_files = [
+        *input_dir.glob("performance_baselines*.json"),
+        *input_dir.glob("performance_baselines*.jsonl"),
+    ]
 
     if not baseline_files:
         raise FileNotFoundError(f"No baseline files found in {input_dir}")
 
-    baselines = []
-    for file_path in sorted(baseline_files):
+    cache_file = input_dir / BASELINE_CACHE_FILE
+    cache = _load_cache(cache_file) if use_cache else {}
+    updated_cache: dict[str, Any] = {}
+
+    def load_one(file_path: Path) -> dict[str, Any] | Exception:
         try:
-            with Path(file_path).open(encoding="utf-8") as f:
-                data = json.load(f)
-                baselines.append(data)
+            return _load_baseline(file_path, cache)
         except Exception as e:
-            print(f"⚠️  Warning: Could not load {file_path}: {e}")
+            return e
+
+    # Overlap file reads and decoding; map() keeps results in file order
+    sorted_files = sorted(baseline_files)
+    with ThreadPoolExecutor(max_workers=min(32, len(sorted_files))) as executor:
+        results = list(executor.map(load_one, sorted_files))
+
+    baselines = []
+    for file_path, entry in zip(sorted_files, results, strict=True):
+        if isinstance(entry, Exception):
+            print(f"⚠️  Warning: Could not load {file_path}: {entry}")
+            continue
+        updated_cache[file_path.name] = entry
+        baselines.extend(entry["baselines"])
 
     if not baselines:
         raise ValueError("No valid baseline files could be loaded")
 
+    if use_cache and updated_cache != cache:
+        _save_cache(cache_file, updated_cache)
+
     return baselines
 
 
+def _sorted_median(ordered: list[float]) -> float:
+    """Return the median of an already sorted, non-empty list.
+
+    Args:
+        ordered: Values sorted in ascending order
+
+    Returns:
+        Median value
+    """
+    mid = len(ordered) // 2
+    if len(ordered) % 2:
+        return ordered[mid]
+    return (ordered[mid - 1] + ordered[mid]) / 2
+
+
+def _mean_stdev(values: list[float]) -> tuple[float, float]:
+    """Compute mean and sample standard deviation in a single pass.
+
+    Uses Welford's online algorithm, which stays numerically stable without a
+    second pass over the data.
+
+    Args:
+        values: Non-empty list of values
+
+    Returns:
+        Tuple of (mean, sample standard deviation); stdev is 0 for one value
+    """
+    mean = 0.0
+    m2 = 0.0
+    for count, value in enumerate(values, 1):
+        delta = value - mean
+        mean += delta / count
+        m2 += delta * (value - mean)
+
+    count = len(values)
+    return mean, math.sqrt(m2 / (count - 1)) if count > 1 else 0.0
+
+
 def aggregate_operation_stats(baselines: list[dict[str, Any]]) -> dict[str, dict[str, Any]]:
     """Aggregate statistics across all baseline measurements.
 
+    Operations measured with ``--parallel`` ran alongside each other and are
+    slower than in CI, so they are left out of the aggregate.
+
     Args:
         baselines: List of baseline data dictionaries
 
@@ -63,10 +289,14 @@ def aggregate_operation_stats(baselines: list[dict[str, Any]]) -> dict[str, dict
         Dictionary mapping operation names to aggregated statistics
     """
     operation_data: dict[str, list[float]] = {}
+    skipped_parallel = 0
 
     for baseline in baselines:
         operations = baseline.get("operations", {})
         for op_name, op_stats in operations.items():
+            if op_stats.get("parallel", False):
+                skipped_parallel += 1
+                continue
             if op_stats.get("iterations_successful", 0) > 0:
                 p95 = op_stats.get("p95", op_stats.get("max", 0))
                 if p95 > 0:
@@ -74,22 +304,28 @@ def aggregate_operation_stats(baselines: list[dict[str, Any]]) -> dict[str, dict
                         operation_data[op_name] = []
                     operation_data[op_name].append(p95)
 
+    if skipped_parallel:
+        print(f"   Skipped {skipped_parallel} operation measurement(s) taken with --parallel")
+
     # Calculate aggregate statistics
     aggregated = {}
     for op_name, p95_values in operation_data.items():
         if not p95_values:
             continue
 
+        # Sort once and read min/max/median/P95 straight from the ordered values
+        ordered = sorted(p95_values)
+        count = len(ordered)
+        mean, stdev = _mean_stdev(ordered)
+
         aggregated[op_name] = {
-            "measurements_count": len(p95_values),
-            "min_p95": min(p95_values),
-            "max_p95": max(p95_values),
-            "mean_p95": statistics.mean(p95_values),
-            "median_p95": statistics.median(p95_values),
-            "stdev_p95": statistics.stdev(p95_values) if len(p95_values) > 1 else 0,
-            "aggregate_p95": sorted(p95_values)[int(len(p95_values) * 0.95)]
-            if len(p95_values) >= 20
-            else max(p95_values),
+            "measurements_count": count,
+            "min_p95": ordered[0],
+            "max_p95": ordered[-1],
+            "mean_p95": mean,
+            "median_p95": _sorted_median(ordered),
+            "stdev_p95": stdev,
+            "aggregate_p95": ordered[int(count * 0.95)] if count >= 20 else ordered[-1],
         }
 
     return aggregated
@@ -155,8 +391,11 @@ def save_thresholds(thresholds: dict[str, Any], output_file: Path) -> None:
     """
     output_file.parent.mkdir(parents=True, exist_ok=True)
 
-    with output_file.open("w", encoding="utf-8") as f:
-        json.dump(thresholds, f, indent=2, ensure_ascii=False)
+    if orjson is not None:
+        output_file.write_bytes(orjson.dumps(thresholds, option=orjson.OPT_INDENT_2))
+    else:
+        with output_file.open("w", encoding="utf-8") as f:
+            json.dump(thresholds, f, indent=2, ensure_ascii=False)
 
     print(f"\n✅ Thresholds saved to: {output_file}")
 
@@ -167,36 +406,45 @@ def print_thresholds(thresholds: dict[str, Any]) -> None:
     Args:
         thresholds: Threshold recommendations
     """
-    print("\n" + "=" * 70)
-    print("PERFORMANCE THRESHOLD RECOMMENDATIONS")
-    print("=" * 70)
-
     metadata = thresholds["metadata"]
-    print(f"\nGenerated: {metadata['generated_at']}")
-    print(f"Method: {metadata['calculation_method']}")
-    print(f"Safety Margin: {metadata['safety_margin'] * 100}%")
-
-    print("\n" + "-" * 70)
-    print("OPERATION THRESHOLDS")
-    print("-" * 70)
+    lines = [
+        "\n" + "=" * 70,
+        "PERFORMANCE THRESHOLD RECOMMENDATIONS",
+        "=" * 70,
+        f"\nGenerated: {metadata['generated_at']}",
+        f"Method: {metadata['calculation_method']}",
+        f"Safety Margin: {metadata['safety_margin'] * 100}%",
+        "\n" + "-" * 70,
+        "OPERATION THRESHOLDS",
+        "-" * 70,
+    ]
 
     for op_name, op_threshold in thresholds["operation_thresholds"].items():
-        print(f"\n{op_name}:")
-        print(f"  Base P95:              {op_threshold['base_p95']:.2f}s")
-        print(f"  Recommended Threshold: {op_threshold['recommended_threshold']:.2f}s")
-        print(f"  Based on:              {op_threshold['measurements_count']} measurements")
+        lines += [
+            f"\n{op_name}:",
+            f"  Base P95:              {op_threshold['base_p95']:.2f}s",
+            f"  Recommended Threshold: {op_threshold['recommended_threshold']:.2f}s",
+            f"  Based on:              {op_threshold['measurements_count']} measurements",
+        ]
 
     if "parallel_execution" in thresholds:
         parallel = thresholds["parallel_execution"]
-        print("\n" + "-" * 70)
-        print("PARALLEL EXECUTION")
-        print("-" * 70)
-        print(f"\nRecommended Total Timeout:        {parallel['recommended_threshold']:.2f}s")
-        print(f"Per-Operation Timeout:            {parallel['per_operation_timeout']:.2f}s")
+        lines += [
+            "\n" + "-" * 70,
+            "PARALLEL EXECUTION",
+            "-" * 70,
+            f"\nRecommended Total Timeout:        {parallel['recommended_threshold']:.2f}s",
+            f"Per-Operation Timeout:            {parallel['per_operation_timeout']:.2f}s",
+        ]
+
+    lines += [
+        "\n" + "=" * 70,
+        "\n💡 Use these thresholds in update_readme_stats.py and CI/CD workflows.",
+        "⚠️  Thresholds are conservative (P95 + 20% safety margin).",
+    ]
 
-    print("\n" + "=" * 70)
-    print("\n💡 Use these thresholds in update_readme_stats.py and CI/CD workflows.")
-    print("⚠️  Thresholds are conservative (P95 + 20% safety margin).")
+    # Emit the whole report with a single write
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def main() -> int:
@@ -208,7 +456,7 @@ def main() -> int:
         "--input-dir",
         type=Path,
         default=PROJECT_ROOT,
-        help="Directory containing baseline JSON files (default: project root)",
+        help="Directory containing baseline JSON/JSONL files (default: project root)",
     )
     parser.add_argument(
         "--output",
@@ -222,12 +470,17 @@ def main() -> int:
         default=0.20,
         help="Safety margin as decimal (default: 0.20 = 20%%)",
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Parse every baseline file instead of reusing .cache/baseline_stats.json",
+    )
     args = parser.parse_args()
 
     try:
         print("🔍 Loading baseline measurements...")
-        baselines = load_baseline_files(args.input_dir)
-        print(f"   Loaded {len(baselines)} baseline files")
+        baselines = load_baseline_files(args.input_dir, use_cache=not args.no_cache)
+        print(f"   Loaded {len(baselines)} baselines")
 
         print("\n📊 Aggregating statistics...")
         aggregated = aggregate_operation_stats(baselines)
@@ -6,6 +6,11 @@ This script queries the GitHub API to get all release tags (including pre-releas
 and writes them to release_tags.txt. It requires a GITHUB_TOKEN environment variable
 for authentication.
 
+The ETag of the release listing is stored in release_tags.txt.etag. On the next
+run a conditional request is sent first, and if GitHub answers 304 Not Modified
+the existing release_tags.txt is kept without fetching the tags again. Delete
+either file to force a refresh.
+
 Usage:
     python get_release_tags.py
 
@@ -18,87 +23,482 @@ Exit Codes:
     1: Missing GITHUB_TOKEN or API error
 """
 
+import base64
+from contextlib import closing, suppress
 import getpass
+from http import HTTPStatus
+import http.client
 import json
 import os
 from pathlib import Path
 import subprocess
 import sys
+from typing import Any
+import urllib.parse
 import urllib.request
 
+try:
+    import orjson
+except ImportError:  # orjson is an optional speedup
+    orjson = None  # type: ignore[assignment]
+
 
 class GitHubAPIError(Exception):
     """Custom exception for GitHub API errors."""
 
 
-def get_release_tags(repo: str, token: str) -> list[str]:  # noqa: C901
+GITHUB_API_HOST = "api.github.com"
+
+# Redirects followed for GET requests (e.g. a renamed repository), as urlopen did
+REDIRECT_STATUSES = frozenset(
+    {
+        HTTPStatus.MOVED_PERMANENTLY,
+        HTTPStatus.FOUND,
+        HTTPStatus.SEE_OTHER,
+        HTTPStatus.TEMPORARY_REDIRECT,
+        HTTPStatus.PERMANENT_REDIRECT,
+    }
+)
+MAX_REDIRECTS = 5
+
+# Only tag names are requested, so each page is a fraction of the REST payload
+RELEASES_QUERY = """
+query($owner: String!, $name: String!, $cursor: String) {
+  repository(owner: $owner, name: $name) {
+    releases(first: 100, after: $cursor, orderBy: {field: CREATED_AT, direction: DESC}) {
+      pageInfo { endCursor hasNextPage }
+      nodes { tagName }
+    }
+  }
+}
+"""
+
+
+def open_api_connection() -> http.client.HTTPSConnection:
     """
-    Query GitHub API for all release tags.
+    Open a keep-alive connection to the GitHub API.
+
+    Reusing one connection for every request saves a TCP and TLS handshake
+    per page. An HTTPS proxy configured in the environment (HTTPS_PROXY,
+    NO_PROXY) is honoured the same way urllib does, by tunnelling through it
+    with CONNECT.
+
+    Returns:
+        Unconnected HTTPS connection; it connects on the first request
+    """
+    proxy = urllib.request.getproxies().get("https")
+    if not proxy or urllib.request.proxy_bypass(GITHUB_API_HOST):
+        return http.client.HTTPSConnection(GITHUB_API_HOST, timeout=30)
+
+    # Proxies are often given as host:port without a scheme
+    proxy_url = urllib.parse.urlsplit(proxy if "://" in proxy else f"http://{proxy}")
+    if not proxy_url.hostname:
+        return http.client.HTTPSConnection(GITHUB_API_HOST, timeout=30)
+
+    tunnel_headers = {}
+    if proxy_url.username:
+        user = urllib.parse.unquote(proxy_url.username)
+        password = urllib.parse.unquote(proxy_url.password or "")
+        encoded = base64.b64encode(f"{user}:{password}".encode()).decode("ascii")
+        tunnel_headers["Proxy-Authorization"] = f"Basic {encoded}"
+
+    conn = http.client.HTTPSConnection(proxy_url.hostname, proxy_url.port, timeout=30)
+    conn.set_tunnel(GITHUB_API_HOST, headers=tunnel_headers)
+    return conn
+
+
+def _api_headers(token: str) -> dict[str, str]:
+    """
+    Build the common GitHub API request headers.
 
     Args:
-        repo: Repository in format 'owner/repo'
         token: GitHub authentication token
 
     Returns:
-        List of release tag names
-
-    Raises:
-        GitHubAPIError: If API request fails
+        Request headers including authorization
     """
-    url = f"https://api.github.com/repos/{repo}/releases"
-    headers = {
+    return {
         "Accept": "application/vnd.github.v3+json",
         "Authorization": f"Bearer {token}",
         "User-Agent": "pyMM-sphinx-multiversion",
     }
 
+
+def _request(
+    conn: http.client.HTTPSConnection,
+    method: str,
+    path: str,
+    headers: dict[str, str],
+    body: bytes | None = None,
+) -> tuple[int, http.client.HTTPMessage, bytes]:
+    """
+    Send a request over the shared connection, following API redirects.
+
+    GET requests redirected to another path on the API host, as GitHub does
+    for renamed repositories, are re-issued to the new location.
+
+    Args:
+        conn: Shared GitHub API connection
+        method: HTTP method
+        path: Request path including query string
+        headers: Request headers
+        body: Optional request body
+
+    Returns:
+        Tuple of (status, response headers, response body)
+
+    Raises:
+        GitHubAPIError: If the request fails at the network level or is
+            redirected off the API host or too often
+    """
+    for _ in range(MAX_REDIRECTS + 1):
+        status, response_headers, data = _send(conn, method, path, headers, body)
+        location = response_headers.get("Location")
+        if method != "GET" or status not in REDIRECT_STATUSES or not location:
+            return status, response_headers, data
+
+        target = urllib.parse.urlsplit(location)
+        if target.netloc and target.hostname != GITHUB_API_HOST:
+            raise GitHubAPIError(f"GitHub API redirected off {GITHUB_API_HOST}: {location}")
+        path = f"{target.path}?{target.query}" if target.query else target.path
+
+    raise GitHubAPIError(f"GitHub API redirected more than {MAX_REDIRECTS} times")
+
+
+def _send(
+    conn: http.client.HTTPSConnection,
+    method: str,
+    path: str,
+    headers: dict[str, str],
+    body: bytes | None = None,
+) -> tuple[int, http.client.HTTPMessage, bytes]:
+    """
+    Send one request over the shared connection and read the full response.
+
+    The response body is always read so the connection can be reused. If the
+    server closed the idle connection, the request is retried once.
+
+    Args:
+        conn: Shared GitHub API connection
+        method: HTTP method
+        path: Request path including query string
+        headers: Request headers
+        body: Optional request body
+
+    Returns:
+        Tuple of (status, response headers, response body)
+
+    Raises:
+        GitHubAPIError: If the request fails at the network level
+    """
+    retried = False
+    while True:
+        try:
+            conn.request(method, path, body=body, headers=headers)
+            response = conn.getresponse()
+            return response.status, response.headers, response.read()
+        except (http.client.HTTPException, OSError) as e:
+            conn.close()
+            # The server may have dropped the idle keep-alive connection
+            if not retried and isinstance(e, (ConnectionResetError, BrokenPipeError)):
+                retried = True
+                continue
+            raise GitHubAPIError(f"GitHub API network error: {e}") from e
+
+
+def _fetch_json(
+    conn: http.client.HTTPSConnection,
+    method: str,
+    path: str,
+    headers: dict[str, str],
+    body: bytes | None = None,
+) -> Any:
+    """
+    Perform a GitHub API request and decode the JSON response.
+
+    Args:
+        conn: Shared GitHub API connection
+        method: HTTP method
+        path: Request path including query string
+        headers: Request headers
+        body: Optional request body
+
+    Returns:
+        Decoded JSON payload
+
+    Raises:
+        GitHubAPIError: If the request fails or the response is not valid JSON
+    """
+    status, _, data = _request(conn, method, path, headers, body)
+    if status != HTTPStatus.OK:
+        error_body = data.decode(errors="replace")
+        raise GitHubAPIError(f"GitHub API HTTP error {status}: {error_body}")
+
+    return _decode_json(data)
+
+
+def _decode_json(data: bytes) -> Any:
+    """
+    Decode a JSON response body, using orjson when it is installed.
+
+    Args:
+        data: Raw response body
+
+    Returns:
+        Decoded JSON payload
+
+    Raises:
+        GitHubAPIError: If the body is not valid JSON
+    """
+    try:
+        return orjson.loads(data) if orjson is not None else json.loads(data)
+    except json.JSONDecodeError as e:
+        raise GitHubAPIError(f"Failed to parse GitHub API response: {e}") from e
+
+
+def _rest_tag_names(releases: Any) -> list[str]:
+    """
+    Extract tag names from a page of REST release objects.
+
+    Args:
+        releases: Decoded body of a REST releases listing
+
+    Returns:
+        Tag names of all releases on the page (including pre-releases)
+
+    Raises:
+        GitHubAPIError: If the body is not a list of release objects
+    """
+    if not isinstance(releases, list) or not all(isinstance(r, dict) for r in releases):
+        raise GitHubAPIError(f"Unexpected GitHub releases response: {releases}")
+
+    return [release["tag_name"] for release in releases if release.get("tag_name")]
+
+
+def _get_release_tags_graphql(
+    conn: http.client.HTTPSConnection, repo: str, headers: dict[str, str]
+) -> list[str]:
+    """
+    Query the GitHub GraphQL API for release tag names.
+
+    Args:
+        conn: Shared GitHub API connection
+        repo: Repository in format 'owner/repo'
+        headers: Request headers including authorization
+
+    Returns:
+        List of release tag names
+
+    Raises:
+        GitHubAPIError: If API request fails or returns GraphQL errors
+    """
+    owner, _, name = repo.partition("/")
+    tags: list[str] = []
+    cursor = None
+
+    while True:
+        body = json.dumps(
+            {
+                "query": RELEASES_QUERY,
+                "variables": {"owner": owner, "name": name, "cursor": cursor},
+            }
+        ).encode()
+        payload = _fetch_json(conn, "POST", "/graphql", headers, body)
+
+        if not isinstance(payload, dict):
+            raise GitHubAPIError(f"Unexpected GitHub GraphQL response: {payload}")
+
+        if payload.get("errors"):
+            messages = "; ".join(
+                error.get("message", "") if isinstance(error, dict) else str(error)
+                for error in payload["errors"]
+            )
+            raise GitHubAPIError(f"GitHub GraphQL error: {messages}")
+
+        try:
+            releases = payload["data"]["repository"]["releases"]
+            # Extract tag names from all releases (including pre-releases)
+            tags.extend(
+                node["tagName"] for node in releases["nodes"] if node and node.get("tagName")
+            )
+            page_info = releases["pageInfo"]
+            has_next_page = page_info["hasNextPage"]
+            cursor = page_info["endCursor"]
+        except (KeyError, TypeError, AttributeError) as e:
+            raise GitHubAPIError(f"Unexpected GitHub GraphQL response: {payload}") from e
+
+        if not has_next_page:
+            break
+
+    return tags
+
+
+def _get_release_tags_rest(
+    conn: http.client.HTTPSConnection, repo: str, headers: dict[str, str]
+) -> list[str]:
+    """
+    Query the GitHub REST API for release tag names.
+
+    Args:
+        conn: Shared GitHub API connection
+        repo: Repository in format 'owner/repo'
+        headers: Request headers including authorization
+
+    Returns:
+        List of release tag names
+
+    Raises:
+        GitHubAPIError: If API request fails
+    """
+    path = f"/repos/{repo}/releases"
     tags = []
     page = 1
     per_page = 100
 
     # Paginate through all releases
     while True:
-        paginated_url = f"{url}?page={page}&per_page={per_page}"
+        data = _fetch_json(conn, "GET", f"{path}?page={page}&per_page={per_page}", headers)
 
-        try:
-            req = urllib.request.Request(paginated_url, headers=headers)  # noqa: S310
-            with urllib.request.urlopen(req, timeout=30) as response:  # noqa: S310
-                if response.status != 200:
-                    raise GitHubAPIError(f"GitHub API returned status {response.status}")  # noqa: TRY301
-
-                data = json.loads(response.read().decode())
-
-                # No more releases
-                if not data:
-                    break
-
-                # Extract tag names from all releases (including pre-releases)
-                for release in data:
-                    tag_name = release.get("tag_name")
-                    if tag_name:
-                        tags.append(tag_name)
-
-                # Check if there are more pages
-                if len(data) < per_page:
-                    break
-
-                page += 1
-
-        except urllib.error.HTTPError as e:
-            error_body = e.read().decode() if e.fp else ""
-            raise GitHubAPIError(f"GitHub API HTTP error {e.code}: {error_body}") from e
-        except urllib.error.URLError as e:
-            raise GitHubAPIError(f"GitHub API network error: {e.reason}") from e
-        except json.JSONDecodeError as e:
-            raise GitHubAPIError(f"Failed to parse GitHub API response: {e}") from e
-        except GitHubAPIError:
-            raise
-        except Exception as e:
-            raise GitHubAPIError(f"Unexpected error querying GitHub API: {e}") from e
+        # No more releases
+        if not data:
+            break
+
+        tags.extend(_rest_tag_names(data))
+
+        # Check if there are more pages
+        if len(data) < per_page:
+            break
+
+        page += 1
 
     return tags
 
 
+def get_release_tags(
+    repo: str, token: str, conn: http.client.HTTPSConnection | None = None
+) -> list[str]:
+    """
+    Query GitHub API for all release tags.
+
+    Tag names are fetched through the GraphQL API, which returns only the
+    requested field. If the GraphQL request fails, the REST releases endpoint
+    is used instead.
+
+    Args:
+        repo: Repository in format 'owner/repo'
+        token: GitHub authentication token
+        conn: Connection to reuse; a temporary one is opened if omitted
+
+    Returns:
+        List of release tag names
+
+    Raises:
+        GitHubAPIError: If API request fails
+    """
+    if conn is None:
+        with closing(open_api_connection()) as own_conn:
+            return get_release_tags(repo, token, own_conn)
+
+    headers = _api_headers(token)
+
+    try:
+        return _get_release_tags_graphql(conn, repo, headers)
+    except GitHubAPIError as e:
+        print(
+            f"WARNING: GraphQL query failed ({e}), falling back to REST API",
+            file=sys.stderr,
+        )
+
+    return _get_release_tags_rest(conn, repo, headers)
+
+
+def check_releases_changed(
+    repo: str,
+    token: str,
+    etag: str | None,
+    conn: http.client.HTTPSConnection | None = None,
+) -> tuple[bool, str | None, list[str] | None]:
+    """
+    Check whether the release list changed since a previous ETag.
+
+    Sends a conditional request for the first page of the REST releases
+    listing; new releases and edits or deletions among the latest 100
+    releases change its ETag. If that page already holds every release, its
+    tag names are returned so they need not be fetched again.
+
+    Args:
+        repo: Repository in format 'owner/repo'
+        token: GitHub authentication token
+        etag: ETag stored by the previous run, if any
+        conn: Connection to reuse; a temporary one is opened if omitted
+
+    Returns:
+        Tuple of (changed, etag, tags); changed is False if GitHub returned
+        304, and tags is None unless the first page listed every release
+
+    Raises:
+        GitHubAPIError: If API request fails
+    """
+    if conn is None:
+        with closing(open_api_connection()) as own_conn:
+            return check_releases_changed(repo, token, etag, own_conn)
+
+    headers = _api_headers(token)
+    if etag:
+        headers["If-None-Match"] = etag
+
+    per_page = 100
+    status, response_headers, data = _request(
+        conn, "GET", f"/repos/{repo}/releases?per_page={per_page}", headers
+    )
+    if status == HTTPStatus.NOT_MODIFIED:
+        return False, etag, None
+    if status != HTTPStatus.OK:
+        raise GitHubAPIError(f"GitHub API HTTP error {status}")
+
+    releases = _decode_json(data)
+    page_tags = _rest_tag_names(releases)
+    # A short first page is the complete list; reuse it instead of refetching
+    tags = page_tags if len(releases) < per_page else None
+    return True, response_headers.get("ETag"), tags
+
+
+def _read_etag(output_file: Path, etag_file: Path) -> str | None:
+    """
+    Read the ETag saved by the previous run.
+
+    Args:
+        output_file: Release tags file the ETag belongs to
+        etag_file: File holding the ETag
+
+    Returns:
+        Saved ETag, or None if there is none or the tags file is missing
+    """
+    if not output_file.exists():
+        return None
+
+    with suppress(OSError):
+        return etag_file.read_text(encoding="utf-8").strip() or None
+    return None
+
+
+def _save_etag(etag_file: Path, etag: str | None) -> None:
+    """
+    Store the ETag for the next run, or remove a stale one (best effort).
+
+    Args:
+        etag_file: File holding the ETag
+        etag: ETag of the current release listing, if GitHub sent one
+    """
+    try:
+        if etag:
+            etag_file.write_text(f"{etag}\n", encoding="utf-8")
+        else:
+            etag_file.unlink(missing_ok=True)
+    except OSError as e:
+        print(f"WARNING: Failed to write {etag_file}: {e}", file=sys.stderr)
+
+
 def prompt_for_token() -> str | None:  # noqa: C901, PLR0912, PLR0915
     """
     Interactively prompt user for GitHub token and storage preference.
@@ -300,9 +700,31 @@ def main() -> int:
     # Get repository (from environment or default)
     repo = os.environ.get("GITHUB_REPOSITORY", "mosh666/pyMM")
 
+    output_file = Path("release_tags.txt")
+    etag_file = output_file.with_name(f"{output_file.name}.etag")
+
     try:
-        # Fetch release tags
-        tags = get_release_tags(repo, token)
+        # Skip the fetch entirely if the release list is unchanged
+        previous_etag = _read_etag(output_file, etag_file)
+
+        # One keep-alive connection serves the check and every page
+        with closing(open_api_connection()) as conn:
+            try:
+                changed, etag, tags = check_releases_changed(repo, token, previous_etag, conn)
+            except GitHubAPIError as e:
+                print(f"WARNING: Release change check failed ({e})", file=sys.stderr)
+                changed, etag, tags = True, None, None
+
+            if not changed:
+                print(
+                    f"✓ Release tags unchanged, keeping existing {output_file}",
+                    file=sys.stderr,
+                )
+                return 0
+
+            # Fetch release tags unless the check already returned all of them
+            if tags is None:
+                tags = get_release_tags(repo, token, conn)
 
         if not tags:
             print(
@@ -315,11 +737,8 @@ def main() -> int:
             )
 
         # Write tags to file
-        output_file = Path("release_tags.txt")
         try:
-            with output_file.open("w", encoding="utf-8") as f:
-                for tag in tags:
-                    f.write(f"{tag}\n")
+            output_file.write_text("".join(f"{tag}\n" for tag in tags), encoding="utf-8")
             print(
                 f"✓ Successfully wrote {len(tags)} release tag(s) to {output_file}",
                 file=sys.stderr,
@@ -331,6 +750,9 @@ def main() -> int:
             )
             return 1
 
+        # Remember the ETag for the next run
+        _save_etag(etag_file, etag)
+
         return 0
 
     except GitHubAPIError as e:
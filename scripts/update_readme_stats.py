@@ -13,7 +13,9 @@ Usage:
 from __future__ import annotations
 
 import argparse
+from collections.abc import Iterator
 from contextlib import suppress
+import os
 from pathlib import Path
 import re
 import sys
@@ -22,6 +24,11 @@ from typing import Any
 # Project root directory
 PROJECT_ROOT = Path(__file__).parent.parent
 
+# Directories never descended into when scanning the project tree
+EXCLUDED_DIRS = frozenset(
+    {".git", ".venv", "venv", "__pycache__", "htmlcov", ".pytest_cache", "node_modules"}
+)
+
 
 def get_python_versions() -> list[str]:
     """Extract supported Python versions from pyproject.toml."""
@@ -38,41 +45,43 @@ def get_python_versions() -> list[str]:
     return sorted(versions)
 
 
-def get_plugin_count() -> int:
-    """Count number of plugins in the plugins/ directory."""
+def _plugin_dirs() -> list[os.DirEntry[str]]:
+    """List plugin directory entries in plugins/, sorted by name.
+
+    Uses os.scandir so the directory type comes from the cached entry
+    instead of a stat call per plugin.
+    """
     plugins_dir = PROJECT_ROOT / "plugins"
-    if not plugins_dir.exists():
-        return 0
+    if not plugins_dir.is_dir():
+        return []
+
+    # Skip __pycache__ and hidden dirs
+    with os.scandir(plugins_dir) as it:
+        entries = [
+            entry for entry in it if entry.is_dir() and not entry.name.startswith(("_", "."))
+        ]
+    return sorted(entries, key=lambda entry: entry.name)
 
-    # Count directories (exclude __pycache__ and hidden dirs)
-    return len(
-        [d for d in plugins_dir.iterdir() if d.is_dir() and not d.name.startswith(("_", "."))]
-    )
+
+def get_plugin_count() -> int:
+    """Count number of plugins in the plugins/ directory."""
+    return len(_plugin_dirs())
 
 
 def get_plugin_list() -> list[dict[str, Any]]:
     """Get list of plugins with their metadata."""
-    plugins_dir = PROJECT_ROOT / "plugins"
-    if not plugins_dir.exists():
-        return []
-
     plugins = []
-    for plugin_dir in sorted(plugins_dir.iterdir()):
-        if not plugin_dir.is_dir() or plugin_dir.name.startswith(("_", ".")):
-            continue
-
+    for entry in _plugin_dirs():
         # Look for plugin.yaml or manifest.yaml
-        manifest_file = None
-        for name in ["plugin.yaml", "manifest.yaml", "plugin.yml", "manifest.yml"]:
-            candidate = plugin_dir / name
-            if candidate.exists():
-                manifest_file = candidate
-                break
+        has_manifest = any(
+            Path(entry.path, name).exists()
+            for name in ["plugin.yaml", "manifest.yaml", "plugin.yml", "manifest.yml"]
+        )
 
         plugin_info = {
-            "name": plugin_dir.name,
-            "title": plugin_dir.name.replace("-", " ").title(),
-            "has_manifest": manifest_file is not None,
+            "name": entry.name,
+            "title": entry.name.replace("-", " ").title(),
+            "has_manifest": has_manifest,
         }
 
         plugins.append(plugin_info)
@@ -80,6 +89,25 @@ def get_plugin_list() -> list[dict[str, Any]]:
     return plugins
 
 
+def _walk_files(root: str | Path) -> Iterator[os.DirEntry[str]]:
+    """Yield file entries under root in a single scandir pass.
+
+    Directories in EXCLUDED_DIRS are pruned at the directory boundary, so
+    virtualenvs and caches are never descended into.
+    """
+    try:
+        it = os.scandir(root)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                if entry.name not in EXCLUDED_DIRS:
+                    yield from _walk_files(entry.path)
+            elif entry.is_file():
+                yield entry
+
+
 def get_test_stats() -> dict[str, Any]:
     """Get test count and coverage statistics."""
     stats = {"test_count": 0, "coverage": "N/A"}
@@ -87,8 +115,11 @@ def get_test_stats() -> dict[str, Any]:
     # Try to get test count
     tests_dir = PROJECT_ROOT / "tests"
     if tests_dir.exists():
-        test_files = list(tests_dir.rglob("test_*.py"))
-        stats["test_count"] = len(test_files)
+        stats["test_count"] = sum(
+            1
+            for entry in _walk_files(tests_dir)
+            if entry.name.startswith("test_") and entry.name.endswith(".py")
+        )
 
     # Try to get coverage from coverage report
     htmlcov_index = PROJECT_ROOT / "htmlcov" / "index.html"
@@ -100,30 +131,30 @@ def get_test_stats() -> dict[str, Any]:
     return stats
 
 
+def _count_lines(path: str) -> int:
+    """Count lines in a file by scanning its raw bytes for newlines.
+
+    A final line without a trailing newline still counts as a line.
+    """
+    data = Path(path).read_bytes()
+    if data and not data.endswith(b"\n"):
+        return data.count(b"\n") + 1
+    return data.count(b"\n")
+
+
 def get_line_count() -> dict[str, int]:
     """Count lines of code in the project."""
     counts = {"python": 0, "yaml": 0, "markdown": 0}
+    extension_keys = {".py": "python", ".yaml": "yaml", ".yml": "yaml", ".md": "markdown"}
+    # Workflow files are not counted as project YAML, at any depth
+    github_part = f"{os.sep}.github{os.sep}"
 
-    # Count Python files
-    for py_file in PROJECT_ROOT.rglob("*.py"):
-        if any(
-            p in py_file.parts for p in [".venv", "venv", "__pycache__", "htmlcov", ".pytest_cache"]
-        ):
+    for entry in _walk_files(PROJECT_ROOT):
+        key = extension_keys.get(os.path.splitext(entry.name)[1])  # noqa: PTH122
+        if key is None or (key == "yaml" and github_part in entry.path):
             continue
         with suppress(Exception):
-            counts["python"] += len(py_file.read_text(encoding="utf-8").splitlines())
-
-    # Count YAML files
-    for yaml_file in list(PROJECT_ROOT.rglob("*.yaml")) + list(PROJECT_ROOT.rglob("*.yml")):
-        if ".github" not in yaml_file.parts and ".venv" not in yaml_file.parts:
-            with suppress(Exception):
-                counts["yaml"] += len(yaml_file.read_text(encoding="utf-8").splitlines())
-
-    # Count Markdown files
-    for md_file in PROJECT_ROOT.rglob("*.md"):
-        if ".venv" not in md_file.parts and "htmlcov" not in md_file.parts:
-            with suppress(Exception):
-                counts["markdown"] += len(md_file.read_text(encoding="utf-8").splitlines())
+            counts[key] += _count_lines(entry.path)
 
     return counts
 
@@ -175,8 +206,10 @@ def get_documentation_completeness() -> dict[str, Any]:
 
     # 2. Count documentation files
     if docs_dir.exists():
-        completeness_data["doc_file_count"] = len(
-            [f for f in docs_dir.rglob("*.md") if not f.name.startswith(("_", "."))]
+        completeness_data["doc_file_count"] = sum(
+            1
+            for entry in _walk_files(docs_dir)
+            if entry.name.endswith(".md") and not entry.name.startswith(("_", "."))
         )
 
     # 3. Check for required sections
@@ -259,15 +292,20 @@ def update_readme_section(content: str, marker: str, new_content: str) -> str:
     start_marker = f"<!-- AUTO-GENERATED:{marker}:START -->"
     end_marker = f"<!-- AUTO-GENERATED:{marker}:END -->"
 
-    pattern = re.compile(
-        rf"({re.escape(start_marker)}).*?({re.escape(end_marker)})",
-        re.DOTALL,
-    )
-
-    replacement = f"{start_marker}\n{new_content}\n{end_marker}"
-
-    if pattern.search(content):
-        return pattern.sub(replacement, content)
+    # Splice each START...END span with str.find; no regex needed
+    parts = []
+    pos = 0
+    while (start := content.find(start_marker, pos)) >= 0:
+        end = content.find(end_marker, start + len(start_marker))
+        if end < 0:
+            break
+        parts.append(content[pos:start])
+        parts.append(f"{start_marker}\n{new_content}\n{end_marker}")
+        pos = end + len(end_marker)
+
+    if parts:
+        parts.append(content[pos:])
+        return "".join(parts)
 
     # If markers don't exist, don't modify
     return content